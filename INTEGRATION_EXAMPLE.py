@@ -10,53 +10,395 @@ into your existing main.py chatbot.
 # ============================================================================
 
 # Add these imports after your existing imports:
-from personalization_helper import PersonalizationHelper
+import asyncio
+import functools
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from personalization_helper import (
+    AsyncPersonalizationHelper,
+    PersonalizationHelper,
+    build_greeting_from_profile,
+    build_personalization_context_from_profile,
+)
+import numpy as np
+import orjson
 import requests
 
+# Static pieces of the chat system prompt, built once at import time.
+# Only the personalization context and the chat history vary per turn,
+# so the prompt is assembled with one join instead of re-rendering the
+# whole multi-line f-string template on every message.
+_PROMPT_HEAD = "You are a friendly, helpful academic advisor chatbot for Indian students.\n\n"
+
+_PROMPT_MID = """
+
+IMPORTANT: Use the personalization insights above to:
+1. Match the user's communication style (formal/casual)
+2. Adjust explanation depth based on their skill levels
+3. Reference their topics of interest when relevant
+4. Provide recommendations aligned with their personality traits
+5. Be aware of their resume performance if applicable
+
+Guidelines:
+- Be conversational and supportive
+- Provide actionable advice
+- Ask clarifying questions when needed
+- Reference past interactions naturally
+
+Current conversation:
+"""
+
+_PROMPT_TAIL = "\n\nRespond to the user's message naturally and helpfully."
+
 # ============================================================================
 # STEP 2: Initialize PersonalizationHelper in your chatbot class
 # ============================================================================
 
 class EnhancedChatbot:
     """Your existing chatbot class with personalization added"""
-    
+
+    # Compiled once at class creation - one O(n) scan per message instead
+    # of lowercasing the text and substring-searching it per keyword
+    RESUME_RE = re.compile(
+        r"\b(resume|cv|my application|job application|my profile|career|"
+        r"how am i doing)\b",
+        re.IGNORECASE
+    )
+
+    # One compiled scan + substitution callback instead of four full-string
+    # .replace passes, each of which allocated a fresh copy of the response
+    FORMAL_MAP = {
+        "Hey": "Hello",
+        "!": ".",
+        " gonna ": " going to ",
+        " wanna ": " want to "
+    }
+    FORMAL_RE = re.compile(r"\bHey\b|!| gonna | wanna ")
+
+    # Only genuinely low-cardinality shapes are worth interning -
+    # personality_traits carries continuous per-user floats that almost
+    # never dedupe, so pooling them would just retain an extra copy per
+    # user. The pool itself is capped so it can't outgrow the profiles
+    # it serves.
+    INTERN_KEYS = ("communication_style", "skill_levels")
+    INTERN_MAX = 1024
+
     def __init__(self, db: SharedDatabase):
         # ... your existing initialization code ...
         
-        # ADD THIS: Initialize personalization helper
+        # ADD THIS: Initialize personalization helpers. The async helper is
+        # what async FastAPI endpoints must use - the sync one would block
+        # the event loop and serialize every concurrent user
         self.personalization = PersonalizationHelper(
             personalization_api_url="http://localhost:8001"
         )
+        self.personalization_async = AsyncPersonalizationHelper(
+            personalization_api_url="http://localhost:8001"
+        )
         
-        # ADD THIS: Cache for profiles (5 minute TTL)
-        self.profile_cache = {}
+        # ADD THIS: Bounded LRU cache for profiles (5 minute TTL)
+        # OrderedDict gives O(1) recency updates and O(1) eviction from the
+        # cold end, so memory stays bounded no matter how many users chat.
+        # Eviction is by approximate byte footprint rather than entry count,
+        # since profiles vary wildly in size (rich resume_insights vs cold
+        # profiles). Budget is configurable via PROFILE_CACHE_BYTES.
+        self.profile_cache = OrderedDict()
         self.cache_ttl = 300  # 5 minutes
+        # Misses are cached too (see _cache_put) but expire much sooner,
+        # so a user who just uploaded their first resume isn't stuck
+        # looking profile-less for the full TTL
+        self.miss_ttl = 30
+        self.byte_budget = int(os.getenv("PROFILE_CACHE_BYTES", 32 * 1024 * 1024))
+        self.cache_bytes = 0  # running total of cached profile sizes
+
+        # ADD THIS: Flyweight pool for the small nested dicts inside
+        # profiles. Thousands of users share a handful of distinct
+        # {"formality": ..., "verbosity": ...} shapes, so identical ones
+        # are deduplicated to a single shared object (see INTERN_KEYS /
+        # INTERN_MAX for what gets pooled and the size bound)
+        self._intern = {}
+
+        # ADD THIS: On-disk second cache tier so profiles survive process
+        # restarts. Lookup order is memory LRU -> SQLite -> remote API;
+        # post-deploy cold starts then pay a local disk read instead of
+        # an HTTP round-trip per user. Lives next to the other shared
+        # JSON stores in shared_data/.
+        os.makedirs("shared_data", exist_ok=True)
+        self._disk = sqlite3.connect(
+            os.path.join("shared_data", "profile_cache.db"),
+            check_same_thread=False
+        )
+        self._disk.execute(
+            "CREATE TABLE IF NOT EXISTS profiles "
+            "(username TEXT PRIMARY KEY, ts REAL, data BLOB)"
+        )
+        self._disk.commit()
+        self._disk_lock = threading.Lock()
+
+        # ADD THIS: Single-flight maps so a cache miss/expiry triggers at
+        # most one fetch per username; concurrent callers wait for it
+        # instead of piling redundant requests onto the service
+        self._inflight = {}  # username -> asyncio.Future (async path)
+        self._inflight_sync = {}  # username -> {"event", "profile"} (sync path)
+        self._inflight_lock = threading.Lock()
+
+        # ADD THIS: Queue feeding a background worker so profile updates
+        # never block a chat reply (started via start_background_workers)
+        self._update_queue = None
+        self._pending_updates = set()  # usernames already queued
+
+        # ADD THIS: Per-chat message counters so the update-cadence check
+        # doesn't fetch the full message list from the DB every turn
+        self.msg_counts = {}
     
     # ========================================================================
     # STEP 3: Add helper methods for personalization
     # ========================================================================
     
+    def _intern_nested(self, d: dict) -> dict:
+        """Return the canonical shared copy of a small nested dict
+
+        Profiles carry a handful of distinct communication-style /
+        skill-level shapes repeated across many users; keying by the
+        sorted serialization lets identical dicts collapse to one object
+        (a flyweight), cutting cache RSS. String values are sys.intern'd
+        for the same reason - "formal"/"mixed" etc. recur everywhere.
+        """
+        key = orjson.dumps(d, option=orjson.OPT_SORT_KEYS)
+        canonical = self._intern.get(key)
+        if canonical is None:
+            # Bound the pool: drop the oldest shape rather than retain
+            # every dict ever seen past its cache entry's lifetime
+            if len(self._intern) >= self.INTERN_MAX:
+                del self._intern[next(iter(self._intern))]
+            canonical = {
+                k: sys.intern(v) if isinstance(v, str) else v
+                for k, v in d.items()
+            }
+            self._intern[key] = canonical
+        return canonical
+
+    def _cache_get(self, username: str, now: float) -> dict:
+        """Return a fresh cached profile or None, expiring stale entries"""
+        entry = self.profile_cache.get(username)
+        if entry is None:
+            return None
+
+        profile, timestamp, size, _context = entry
+        ttl = self.miss_ttl if "_miss" in profile else self.cache_ttl
+        if now - timestamp < ttl:
+            # Mark as most recently used
+            self.profile_cache.move_to_end(username)
+            return profile
+
+        # Expired - drop it so it can't linger at the warm end
+        del self.profile_cache[username]
+        self.cache_bytes -= size
+        return None
+
+    def _cache_put(self, username: str, profile: dict, now: float):
+        """Insert a profile and evict LRU entries past the byte budget
+
+        Missing/empty profiles are stored as a {"_miss": True} sentinel
+        so repeat turns from users with no personalization data (the
+        common case early on) don't re-hit the API every message.
+        """
+        if not profile:
+            profile = {"_miss": True}
+        else:
+            # Dedupe the small nested dicts so identical shapes across
+            # users share one object instead of one copy per cache entry
+            for key in self.INTERN_KEYS:
+                nested = profile.get(key)
+                if nested:
+                    profile[key] = self._intern_nested(nested)
+        # Serialized length is a cheap, close-enough proxy for RAM use
+        size = len(orjson.dumps(profile))
+        # Render the LLM context once per fetch; repeat turns from the
+        # same user read the cached string instead of rebuilding it
+        context = build_personalization_context_from_profile(profile)
+        # Reclaim the old entry's size on overwrite (prewarm or racing
+        # sync/async fetches can re-put a still-fresh user) so
+        # cache_bytes tracks what's actually stored
+        old = self.profile_cache.pop(username, None)
+        if old is not None:
+            self.cache_bytes -= old[2]
+        self.profile_cache[username] = (profile, now, size, context)
+        self.cache_bytes += size
+        while self.cache_bytes > self.byte_budget and self.profile_cache:
+            _, (_, _, evicted_size, _) = self.profile_cache.popitem(last=False)
+            self.cache_bytes -= evicted_size
+
+    def _disk_get(self, username: str) -> dict:
+        """Fetch a still-fresh profile from the disk tier, or None
+
+        Disk entries are stamped with wall-clock time - unlike the
+        in-memory TTLs they have to stay meaningful across restarts,
+        where the monotonic clock resets.
+        """
+        with self._disk_lock:
+            row = self._disk.execute(
+                "SELECT ts, data FROM profiles WHERE username = ?",
+                (username,)
+            ).fetchone()
+        if row is None:
+            return None
+        ts, data = row
+        if time.time() - ts >= self.cache_ttl:
+            return None
+        return orjson.loads(data)
+
+    def _disk_put(self, username: str, profile: dict):
+        """Write a freshly fetched profile through to the disk tier"""
+        with self._disk_lock:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO profiles (username, ts, data) "
+                "VALUES (?, ?, ?)",
+                (username, time.time(), orjson.dumps(profile))
+            )
+            self._disk.commit()
+
+    def _get_cached_context(self, username: str) -> str:
+        """Get the rendered personalization context, cached with the profile"""
+        profile = self._get_cached_profile(username)
+        entry = self.profile_cache.get(username)
+        if entry is not None:
+            return entry[3]
+        # Profile wasn't cacheable (service down / no data) - render inline
+        return build_personalization_context_from_profile(profile)
+
     def _get_cached_profile(self, username: str) -> dict:
-        """Get profile from cache or fetch new"""
-        import time
-        
-        now = time.time()
-        if username in self.profile_cache:
-            profile, timestamp = self.profile_cache[username]
-            if now - timestamp < self.cache_ttl:
-                return profile
-        
-        # Fetch new profile
-        profile = self.personalization.get_user_profile(username)
-        if profile:
-            self.profile_cache[username] = (profile, now)
-        
+        """Get profile from the LRU cache or fetch new"""
+        # Monotonic clock: TTL expiry must not move with wall-clock jumps
+        now = time.monotonic()
+        profile = self._cache_get(username, now)
+        if profile is not None:
+            # A cached miss is a valid answer too - short-circuit instead
+            # of paying the API round-trip again
+            return None if "_miss" in profile else profile
+
+        # Coalesce with an already in-flight fetch for this user
+        with self._inflight_lock:
+            waiter = self._inflight_sync.get(username)
+            is_leader = waiter is None
+            if is_leader:
+                waiter = {"event": threading.Event(), "profile": None}
+                self._inflight_sync[username] = waiter
+
+        if not is_leader:
+            waiter["event"].wait()
+            return waiter["profile"]
+
+        # Fetch new profile (leader only) - try the disk tier first so a
+        # freshly restarted process doesn't re-pay an HTTP RTT per user
+        try:
+            profile = self._disk_get(username)
+            if profile is None:
+                profile = self.personalization.get_user_profile(username)
+                if profile:
+                    self._disk_put(username, profile)
+            waiter["profile"] = profile
+            # Store misses as well - _cache_put turns falsy results into
+            # a short-TTL negative entry
+            self._cache_put(username, profile, now)
+        finally:
+            with self._inflight_lock:
+                self._inflight_sync.pop(username, None)
+            waiter["event"].set()
+
+        return profile
+
+    async def _get_cached_profile_async(self, username: str) -> dict:
+        """Async twin of _get_cached_profile for async endpoints"""
+        now = time.monotonic()
+        profile = self._cache_get(username, now)
+        if profile is not None:
+            return None if "_miss" in profile else profile
+
+        # Coalesce with an already in-flight fetch for this user
+        future = self._inflight.get(username)
+        if future is not None:
+            return await future
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[username] = future
+        try:
+            # Disk tier before the network, as in the sync path - but on
+            # a worker thread: the SQLite read happens under a threading
+            # lock shared with sync callers and must not stall the loop
+            profile = await asyncio.to_thread(self._disk_get, username)
+            if profile is None:
+                profile = await self.personalization_async.get_user_profile(username)
+                if profile:
+                    # Write-back is fire-and-forget so the commit's
+                    # fsync never adds to reply latency
+                    asyncio.get_running_loop().run_in_executor(
+                        None, self._disk_put, username, profile
+                    )
+            self._cache_put(username, profile, now)
+            future.set_result(profile)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(username, None)
+
         return profile
     
+    def prewarm_profiles(self, usernames: list):
+        """Bulk-fetch profiles in one request to warm the cache (e.g. at login)"""
+        now = time.monotonic()
+        for username, profile in self.personalization.get_user_profiles_bulk(usernames).items():
+            if profile:
+                self._cache_put(username, profile, now)
+
     def _should_update_profile(self, username: str, message_count: int) -> bool:
         """Determine if we should trigger a profile update"""
         # Update every 10 messages
         return message_count > 0 and message_count % 10 == 0
+
+    def start_background_workers(self):
+        """Start the profile-update worker (call once at app startup)"""
+        self._update_queue = asyncio.Queue(maxsize=1024)
+        asyncio.create_task(self._update_worker())
+
+    async def _update_worker(self):
+        """Drain queued profile updates off the request path"""
+        while True:
+            username = await self._update_queue.get()
+            self._pending_updates.discard(username)
+            try:
+                await self.personalization_async.trigger_profile_update(username)
+            except Exception as e:
+                logger.warning(f"Background profile update failed for {username}: {e}")
+            finally:
+                self._update_queue.task_done()
+
+    def _schedule_profile_update(self, username: str):
+        """Enqueue a profile update without blocking the chat reply"""
+        if self._update_queue is None:
+            # Worker not running (e.g. scripts outside the server) -
+            # fall back to the old direct call
+            try:
+                self.personalization.trigger_profile_update(username)
+            except Exception as e:
+                logger.warning(f"Profile update failed: {e}")
+            return
+
+        if username in self._pending_updates:
+            return  # already queued - don't enqueue the same user twice
+
+        try:
+            self._update_queue.put_nowait(username)
+            self._pending_updates.add(username)
+        except asyncio.QueueFull:
+            logger.warning(f"Profile update queue full, skipping {username}")
     
     # ========================================================================
     # STEP 4: Modify your main chat method to include personalization
@@ -68,12 +410,13 @@ class EnhancedChatbot:
         
         Replace your existing chat method with this structure
         """
-        
+
+        # One timestamp per request - datetime.now().isoformat() is not
+        # free, and both return paths need the same value anyway
+        timestamp = datetime.now().isoformat()
+
         # Check if user is asking about their resume
-        resume_keywords = ['resume', 'cv', 'my application', 'job application', 
-                          'my profile', 'career', 'how am i doing']
-        
-        if any(keyword in user_message.lower() for keyword in resume_keywords):
+        if self.RESUME_RE.search(user_message):
             # Handle resume question
             resume_summary = self.personalization.get_resume_summary_for_chat(username)
             
@@ -81,38 +424,26 @@ class EnhancedChatbot:
             return {
                 "response": resume_summary,
                 "is_recommendation": False,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "personalized": True
             }
         
-        # Get personalization context
-        personalization_context = self.personalization.build_personalization_context(username)
+        # Get personalization context (rendered once per profile fetch)
+        personalization_context = self._get_cached_context(username)
         
         # Get chat history (your existing code)
         chat_history = self._get_chat_history(chat_id)
         
-        # BUILD ENHANCED SYSTEM PROMPT with personalization
-        system_prompt = f"""You are a friendly, helpful academic advisor chatbot for Indian students.
-
-{personalization_context}
-
-IMPORTANT: Use the personalization insights above to:
-1. Match the user's communication style (formal/casual)
-2. Adjust explanation depth based on their skill levels
-3. Reference their topics of interest when relevant
-4. Provide recommendations aligned with their personality traits
-5. Be aware of their resume performance if applicable
-
-Guidelines:
-- Be conversational and supportive
-- Provide actionable advice
-- Ask clarifying questions when needed
-- Reference past interactions naturally
-
-Current conversation:
-{chat_history}
-
-Respond to the user's message naturally and helpfully."""
+        # BUILD ENHANCED SYSTEM PROMPT with personalization - only the
+        # dynamic pieces are interpolated; the template text is the
+        # module-level _PROMPT_* constants
+        system_prompt = "".join((
+            _PROMPT_HEAD,
+            personalization_context,
+            _PROMPT_MID,
+            chat_history,
+            _PROMPT_TAIL,
+        ))
 
         # YOUR EXISTING LLM CALL (modify to use enhanced prompt)
         response = self.llm.invoke([
@@ -133,19 +464,22 @@ Respond to the user's message naturally and helpfully."""
         # Save message to database (your existing code)
         self._save_message_to_db(chat_id, username, user_message, assistant_response)
         
-        # Check if we should trigger profile update
-        message_count = len(self._get_messages(chat_id))
+        # Check if we should trigger profile update. The counter is kept
+        # in memory - loaded from the DB once per chat, then incremented
+        # on save - instead of materializing the message list every turn
+        if chat_id not in self.msg_counts:
+            self.msg_counts[chat_id] = len(self._get_messages(chat_id))
+        else:
+            self.msg_counts[chat_id] += 2  # user + assistant message saved above
+        message_count = self.msg_counts[chat_id]
         if self._should_update_profile(username, message_count):
-            # Trigger async update (non-blocking)
-            try:
-                self.personalization.trigger_profile_update(username)
-            except Exception as e:
-                logger.warning(f"Profile update failed: {e}")
+            # Hand off to the background worker (non-blocking)
+            self._schedule_profile_update(username)
         
         return {
             "response": assistant_response,
             "is_recommendation": False,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "personalized": profile is not None and profile.get("data_available", False)
         }
     
@@ -157,10 +491,9 @@ Respond to the user's message naturally and helpfully."""
         
         # Make more formal if user prefers formal communication
         if formality == "formal":
-            response = response.replace("Hey", "Hello")
-            response = response.replace("!", ".")
-            response = response.replace(" gonna ", " going to ")
-            response = response.replace(" wanna ", " want to ")
+            response = self.FORMAL_RE.sub(
+                lambda m: self.FORMAL_MAP[m.group(0)], response
+            )
         
         # Make more casual if user prefers casual
         elif formality == "casual":
@@ -192,9 +525,22 @@ Respond to the user's message naturally and helpfully."""
     
     def get_user_insights_for_ui(self, username: str) -> dict:
         """Get formatted insights to display in chat UI"""
-        
         profile = self._get_cached_profile(username)
-        
+        return self._build_insights(profile)
+
+    async def get_user_insights_for_ui_async(self, username: str) -> dict:
+        """Async variant for use in async FastAPI endpoints"""
+        profile = await self._get_cached_profile_async(username)
+        return self._build_insights(profile)
+
+    async def get_personalized_greeting_async(self, username: str) -> str:
+        """Async variant of the personalized greeting"""
+        profile = await self._get_cached_profile_async(username)
+        return build_greeting_from_profile(username, profile)
+
+    def _build_insights(self, profile: dict) -> dict:
+        """Format a profile dict into UI-ready insights"""
+
         if not profile or not profile.get("data_available"):
             return {
                 "has_insights": False,
@@ -217,15 +563,40 @@ Respond to the user's message naturally and helpfully."""
     def _format_personality_type(self, profile: dict) -> str:
         """Format personality type for display"""
         traits = profile.get("personality_traits", {})
-        
-        if not traits or all(v == 0.5 for v in traits.values()):
+
+        if not traits:
             return "Still learning about you..."
-        
+
+        return self._format_traits(tuple(sorted(traits.items())))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _format_traits(trait_items: tuple) -> str:
+        """Render a frozen trait tuple into the display string
+
+        Pure over its input, so identical trait sets - which the UI
+        re-polls for the same user constantly - format once and then hit
+        the memo. The flyweight interning of trait dicts keeps the
+        number of distinct tuples small.
+        """
+        # Threshold all trait values with one C-level vector comparison
+        # instead of a Python-interpreted loop per key
+        names = [name for name, _ in trait_items]
+        values = np.fromiter(
+            (value for _, value in trait_items),
+            dtype=np.float64,
+            count=len(names)
+        )
+
+        if np.allclose(values, 0.5):
+            return "Still learning about you..."
+
         # Find dominant traits
-        high_traits = [k.replace('_', ' ').title() for k, v in traits.items() if v > 0.7]
-        
-        if high_traits:
-            return f"You show strong {', '.join(high_traits[:2])}"
+        high = np.flatnonzero(values > 0.7)
+
+        if high.size:
+            high_traits = [names[i].replace('_', ' ').title() for i in high[:2]]
+            return f"You show strong {', '.join(high_traits)}"
         else:
             return "Balanced learner"
 
@@ -233,12 +604,17 @@ Respond to the user's message naturally and helpfully."""
 # STEP 7: Update FastAPI endpoints
 # ============================================================================
 
+# Start the background profile-update worker once the event loop exists
+@app.on_event("startup")
+async def start_workers():
+    chatbot.start_background_workers()
+
 # Add new endpoint to your FastAPI app
 @app.get("/user/{username}/insights")
 async def get_user_insights(username: str):
     """Get personalization insights for UI display"""
     try:
-        insights = chatbot.get_user_insights_for_ui(username)
+        insights = await chatbot.get_user_insights_for_ui_async(username)
         return insights
     except Exception as e:
         logger.error(f"Error getting insights: {e}")
@@ -251,12 +627,37 @@ async def get_user_insights(username: str):
 async def get_greeting(username: str):
     """Get personalized greeting"""
     try:
-        greeting = chatbot.get_personalized_greeting(username)
+        greeting = await chatbot.get_personalized_greeting_async(username)
         return {"greeting": greeting}
     except Exception as e:
         logger.error(f"Error getting greeting: {e}")
         return {"greeting": f"Hi {username}! 👋"}
 
+@app.get("/user/{username}/bundle")
+async def get_user_bundle(username: str):
+    """Get insights and report in one call
+
+    The UI loads the insights panel and the full report back-to-back;
+    fetching them serially pays two round-trips. Overlapping the two
+    awaits halves the cold-load latency of the panel.
+    """
+    try:
+        profile, report = await asyncio.gather(
+            chatbot._get_cached_profile_async(username),
+            chatbot.personalization_async.get_user_report(username),
+        )
+        return {
+            "insights": chatbot._build_insights(profile),
+            "report": report,
+        }
+    except Exception as e:
+        logger.error(f"Error getting user bundle: {e}")
+        return {
+            "insights": {"has_insights": False},
+            "report": None,
+            "error": str(e)
+        }
+
 # ============================================================================
 # STEP 8: Modify existing chat endpoint
 # ============================================================================
@@ -8,6 +8,7 @@ import os
 import logging
 import json
 import re
+import time
 import requests
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -66,14 +67,15 @@ class PersonalizationIntegration:
             cache_key = f"profile_{username}"
             if cache_key in self.cache:
                 cached_data, timestamp = self.cache[cache_key]
-                if (datetime.now().timestamp() - timestamp) < self.cache_timeout:
+                # Monotonic clock: TTL expiry must not move with wall-clock jumps
+                if (time.monotonic() - timestamp) < self.cache_timeout:
                     return cached_data
             
             response = requests.get(f"{self.api_url}/user/{username}/profile", timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
-                self.cache[cache_key] = (data, datetime.now().timestamp())
+                self.cache[cache_key] = (data, time.monotonic())
                 return data
             else:
                 logger.warning(f"Personalization API returned {response.status_code}")
@@ -341,7 +343,23 @@ class ConversationMemoryManager:
 
 class PersonalizedAcademicChatbot:
     """Academic chatbot with personalization, friend-like conversations, and enhanced features"""
-    
+
+    # Multi-intent router, compiled once. All keyword routes share one
+    # alternation with a named group per intent, so routing stays a
+    # single scan over the message no matter how many intents are added
+    # (the spirit of an Aho-Corasick automaton, without a native
+    # dependency). Every longer phrase from the old keyword lists
+    # ("resume score", "recommend colleges", ...) contains one of these
+    # roots.
+    INTENT_RE = re.compile(
+        r"(?P<resume>\b(?:resume|cv|my application|job application|"
+        r"my profile|career|how am i doing|my performance)\b)"
+        r"|(?P<college>(?:recommend|suggest|show me|list of|best)\s+college"
+        r"|which college should|colleges?\s+for\b"
+        r"|where (?:should|can) i study)",
+        re.IGNORECASE
+    )
+
     def __init__(self, openai_api_key: str, storage_dir: str = "shared_data", model_name: str = "gpt-4o-mini"):
         self.openai_api_key = openai_api_key
         openai.api_key = openai_api_key
@@ -497,19 +515,18 @@ Extract preferences as JSON."""),
             | self.preference_parser
         )
     
+    def _classify_intents(self, message: str) -> set:
+        """Route a message to keyword intents in one pass over the text"""
+        return {
+            name
+            for match in self.INTENT_RE.finditer(message)
+            for name, value in match.groupdict().items()
+            if value is not None
+        }
+
     def _detect_resume_question(self, message: str) -> bool:
         """Detect if user is asking about their resume"""
-        resume_keywords = [
-            'resume', 'cv', 'my application', 'job application',
-            'my profile', 'career', 'how am i doing', 'my performance',
-            'resume score', 'resume analysis', 'resume feedback',
-            'my resume', 'check my resume', 'review my resume',
-            'how is my resume', 'what do you think of my resume',
-            'resume review', 'resume suggestions', 'improve my resume',
-            'resume help', 'resume advice', 'my resume feedback'
-        ]
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in resume_keywords)
+        return "resume" in self._classify_intents(message)
     
     def _get_resume_insights_context(self, username: str) -> str:
         """Get detailed resume insights for personalization"""
@@ -747,14 +764,8 @@ Extract preferences as JSON."""),
             
         except Exception as e:
             logger.error(f"Error in intent classification: {e}")
-            # Fallback to simple keyword matching if LLM fails
-            message_lower = message.lower().strip()
-            fallback_indicators = [
-                'recommend college', 'suggest college', 'which college should',
-                'show me college', 'list of college', 'colleges for',
-                'where should i study', 'where can i study', 'best college for'
-            ]
-            return any(indicator in message_lower for indicator in fallback_indicators)
+            # Fallback to the keyword intent router if LLM fails
+            return "college" in self._classify_intents(message)
     
     def extract_preferences(self, chat_id: str, username: str, current_message: str) -> UserPreferences:
         """Extract user preferences using LLM"""
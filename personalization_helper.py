@@ -5,106 +5,176 @@ This module provides utilities to fetch and use personalization insights in the
 
 import requests
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 
+class _CircuitBreaker:
+    """Fail-fast guard around personalization API calls
+
+    When the service is down, every call otherwise blocks for the full
+    request timeout (5s) before falling back. After `threshold`
+    consecutive failures the breaker opens and calls return immediately
+    for `cooldown` seconds, bounding worst-case chat latency during an
+    outage. Any successful call closes it again.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.fails = 0
+        self.open_until = 0.0
+        self.times_opened = 0
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def record_success(self):
+        self.fails = 0
+
+    def record_failure(self):
+        self.fails += 1
+        if self.fails >= self.threshold:
+            self.open_until = time.monotonic() + self.cooldown
+            self.times_opened += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current breaker state, for logging/monitoring"""
+        return {
+            "consecutive_failures": self.fails,
+            "open": self.is_open(),
+            "times_opened": self.times_opened
+        }
+
+
 class PersonalizationHelper:
     """Helper class to integrate personalization insights into chatbot"""
-    
-    def __init__(self, personalization_api_url: str = "http://localhost:8001"):
-        self.api_url = personalization_api_url
-    
+
+    def __init__(self, personalization_api_url: str = "http://localhost:8001",
+                 socket_path: Optional[str] = None):
+        if socket_path:
+            # Co-located service: talk over a Unix domain socket instead
+            # of loopback TCP, skipping the TCP/IP stack on every call.
+            # Run the server with `uvicorn ... --uds <socket_path>`.
+            import requests_unixsocket
+            from urllib.parse import quote
+
+            self.api_url = "http+unix://" + quote(socket_path, safe="")
+            self.session = requests_unixsocket.Session()
+        else:
+            self.api_url = personalization_api_url
+            # Pooled session with keep-alive so the hot profile-fetch path
+            # reuses TCP connections instead of reconnecting on every call
+            self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.1,
+                status_forcelist=[502, 503, 504]
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Fail fast instead of waiting out the 5s timeout on every call
+        # while the personalization service is down
+        self._breaker = _CircuitBreaker()
+
+    def breaker_metrics(self) -> Dict[str, Any]:
+        """Circuit-breaker state, for logging/monitoring"""
+        return self._breaker.metrics()
+
     def get_user_profile(self, username: str) -> Optional[Dict[str, Any]]:
         """Fetch user personality profile from personalization module"""
+        if self._breaker.is_open():
+            return None  # service known-down - skip the timeout wait
+
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/user/{username}/profile",
                 timeout=5
             )
-            
+            self._breaker.record_success()
+
             if response.status_code == 200:
-                return response.json()
+                # orjson is several times faster than the stdlib parser
+                # on these nested profile/report payloads
+                return orjson.loads(response.content)
             else:
                 logger.warning(f"Failed to fetch profile for {username}: {response.status_code}")
                 return None
-                
+
         except requests.exceptions.RequestException as e:
+            self._breaker.record_failure()
             logger.error(f"Error connecting to personalization module: {e}")
             return None
-    
+
+    def get_user_profiles_bulk(self, usernames: List[str]) -> Dict[str, Any]:
+        """Fetch profiles for several users in a single request
+
+        One POST to /users/profiles replaces N per-user GETs, saving a
+        connect/parse cycle per user on fan-out paths like cache prewarm.
+        """
+        if self._breaker.is_open():
+            return {}
+
+        try:
+            response = self.session.post(
+                f"{self.api_url}/users/profiles",
+                json={"usernames": usernames},
+                timeout=5
+            )
+            self._breaker.record_success()
+
+            if response.status_code == 200:
+                return orjson.loads(response.content).get("profiles", {})
+            else:
+                logger.warning(f"Bulk profile fetch failed: {response.status_code}")
+                return {}
+
+        except requests.exceptions.RequestException as e:
+            self._breaker.record_failure()
+            logger.error(f"Error connecting to personalization module: {e}")
+            return {}
+
     def get_user_report(self, username: str) -> Optional[Dict[str, Any]]:
         """Fetch comprehensive personality report"""
+        if self._breaker.is_open():
+            return None
+
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/user/{username}/report",
                 timeout=5
             )
-            
+            self._breaker.record_success()
+
             if response.status_code == 200:
-                return response.json()
+                # orjson is several times faster than the stdlib parser
+                # on these nested profile/report payloads
+                return orjson.loads(response.content)
             else:
                 logger.warning(f"Failed to fetch report for {username}: {response.status_code}")
                 return None
-                
+
         except requests.exceptions.RequestException as e:
+            self._breaker.record_failure()
             logger.error(f"Error connecting to personalization module: {e}")
             return None
-    
+
     def build_personalization_context(self, username: str) -> str:
         """Build context string with personalization insights for LLM"""
         profile = self.get_user_profile(username)
-        
-        if not profile or not profile.get("data_available", False):
-            return ""
-        
-        context_parts = ["\n[PERSONALIZATION INSIGHTS:]"]
-        
-        # Add personality type
-        personality_type = profile.get("personality_traits", {})
-        if personality_type:
-            traits_str = ", ".join([
-                f"{k}: {v:.2f}" for k, v in personality_type.items()
-                if isinstance(v, (int, float))
-            ])
-            if traits_str:
-                context_parts.append(f"Personality traits: {traits_str}")
-        
-        # Add communication style
-        comm_style = profile.get("communication_style", {})
-        if comm_style:
-            context_parts.append(f"Communication style: {comm_style.get('formality', 'mixed')}, {comm_style.get('verbosity', 'moderate')}")
-        
-        # Add topics of interest
-        topics = profile.get("topics_of_interest", [])
-        if topics:
-            context_parts.append(f"Topics of interest: {', '.join(topics[:5])}")
-        
-        # Add skill levels
-        skills = profile.get("skill_levels", {})
-        if skills:
-            skills_str = ", ".join([f"{k}: {v}" for k, v in skills.items()])
-            context_parts.append(f"Skill levels: {skills_str}")
-        
-        # Add recommendations
-        recs = profile.get("recommendations", {})
-        if recs:
-            learning_recs = recs.get("learning_style", [])
-            if learning_recs:
-                context_parts.append(f"Learning recommendations: {'; '.join(learning_recs[:2])}")
-        
-        # Add resume insights
-        resume_insights = profile.get("resume_insights", {})
-        if resume_insights and resume_insights.get("total_analyses", 0) > 0:
-            context_parts.append(
-                f"Resume performance: {resume_insights.get('average_score', 0)}% average score, "
-                f"{resume_insights.get('improvement_trend', 'stable')} trend"
-            )
-        
-        context_parts.append("[END PERSONALIZATION INSIGHTS]\n")
-        
-        return "\n".join(context_parts)
+        return build_personalization_context_from_profile(profile)
     
     def get_resume_summary_for_chat(self, username: str) -> str:
         """Get resume analysis summary formatted for chat response"""
@@ -125,43 +195,48 @@ class PersonalizationHelper:
         trend = resume_insights.get("improvement_trend", "stable")
         target_roles = resume_insights.get("target_roles", [])
         
-        summary = f"Based on your {total} resume analysis/analyses:\n\n"
-        summary += f"📊 **Average Score**: {avg_score}%\n"
-        summary += f"📈 **Latest Score**: {latest_score}%\n"
-        summary += f"📉 **Trend**: {trend}\n"
-        
+        # Collect parts and join once - repeated += copies the whole
+        # string each time
+        parts = [
+            f"Based on your {total} resume analysis/analyses:\n",
+            f"📊 **Average Score**: {avg_score}%",
+            f"📈 **Latest Score**: {latest_score}%",
+            f"📉 **Trend**: {trend}",
+        ]
+
         if target_roles:
-            summary += f"🎯 **Target Roles**: {', '.join(target_roles[:3])}\n"
-        
-        summary += "\n"
-        
+            parts.append(f"🎯 **Target Roles**: {', '.join(target_roles[:3])}")
+
+        parts.append("")
+
         # Add interpretation
         if avg_score >= 80:
-            summary += "✨ Your resume is in excellent shape! "
+            interpretation = "✨ Your resume is in excellent shape! "
         elif avg_score >= 70:
-            summary += "👍 Your resume is good, with room for improvement. "
+            interpretation = "👍 Your resume is good, with room for improvement. "
         elif avg_score >= 60:
-            summary += "📝 Your resume needs some work to stand out. "
+            interpretation = "📝 Your resume needs some work to stand out. "
         else:
-            summary += "⚠️ Your resume needs significant improvements. "
-        
+            interpretation = "⚠️ Your resume needs significant improvements. "
+
         if trend == "Improving":
-            summary += "Great job on the improvements you've made!"
+            interpretation += "Great job on the improvements you've made!"
         elif trend == "Declining":
-            summary += "Let's work on getting your resume back on track."
+            interpretation += "Let's work on getting your resume back on track."
         else:
-            summary += "Keep refining your resume with each application."
-        
+            interpretation += "Keep refining your resume with each application."
+
+        parts.append(interpretation)
+
         # Get specific recommendations from latest report
         report = self.get_user_report(username)
         if report and report.get("has_data", False):
             improvements = report.get("areas_for_improvement", [])
             if improvements:
-                summary += f"\n\n**Key areas to focus on**:\n"
-                for imp in improvements[:3]:
-                    summary += f"• {imp}\n"
-        
-        return summary
+                parts.append("\n**Key areas to focus on**:")
+                parts.extend(f"• {imp}" for imp in improvements[:3])
+
+        return "\n".join(parts)
     
     def should_personalize_response(self, username: str) -> bool:
         """Check if we should apply personalization for this user"""
@@ -177,50 +252,216 @@ class PersonalizationHelper:
     def get_personalized_greeting(self, username: str) -> str:
         """Generate personalized greeting based on user profile"""
         profile = self.get_user_profile(username)
-        
-        if not profile or not profile.get("data_available", False):
-            return f"Hi {username}! 👋"
-        
-        # Get personality type
-        comm_style = profile.get("communication_style", {})
-        formality = comm_style.get("formality", "mixed")
-        
-        # Get resume insights
-        resume_insights = profile.get("resume_insights", {})
-        has_resume = resume_insights.get("total_analyses", 0) > 0
-        
-        # Customize greeting
-        if formality == "formal":
-            greeting = f"Hello {username},"
-        else:
-            greeting = f"Hey {username}! 👋"
-        
-        # Add context-aware message
-        topics = profile.get("topics_of_interest", [])
-        if topics and len(topics) > 0:
-            greeting += f" Ready to explore {topics[0]} today?"
-        elif has_resume:
-            greeting += " How can I help you with your academic or career goals today?"
-        else:
-            greeting += " What would you like to learn about today?"
-        
-        return greeting
+        return build_greeting_from_profile(username, profile)
     
     def trigger_profile_update(self, username: str) -> bool:
         """Trigger an update of user profile in personalization module"""
+        if self._breaker.is_open():
+            return False
+
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/user/{username}/update",
                 timeout=10
             )
-            
+            self._breaker.record_success()
+
             if response.status_code == 200:
                 logger.info(f"Profile updated successfully for {username}")
                 return True
             else:
                 logger.warning(f"Profile update failed for {username}: {response.status_code}")
                 return False
-                
+
         except requests.exceptions.RequestException as e:
+            self._breaker.record_failure()
             logger.error(f"Error triggering profile update: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+def build_personalization_context_from_profile(profile: Optional[Dict[str, Any]]) -> str:
+    """Build context string for the LLM from an already-fetched profile
+
+    Split out from build_personalization_context so callers that cache
+    profiles can render (and cache) the context once per fetch instead of
+    rebuilding it every chat turn.
+    """
+    if not profile or not profile.get("data_available", False):
+        return ""
+
+    context_parts = ["\n[PERSONALIZATION INSIGHTS:]"]
+
+    # Add personality type
+    personality_type = profile.get("personality_traits", {})
+    if personality_type:
+        traits_str = ", ".join([
+            f"{k}: {v:.2f}" for k, v in personality_type.items()
+            if isinstance(v, (int, float))
+        ])
+        if traits_str:
+            context_parts.append(f"Personality traits: {traits_str}")
+
+    # Add communication style
+    comm_style = profile.get("communication_style", {})
+    if comm_style:
+        context_parts.append(f"Communication style: {comm_style.get('formality', 'mixed')}, {comm_style.get('verbosity', 'moderate')}")
+
+    # Add topics of interest
+    topics = profile.get("topics_of_interest", [])
+    if topics:
+        context_parts.append(f"Topics of interest: {', '.join(topics[:5])}")
+
+    # Add skill levels
+    skills = profile.get("skill_levels", {})
+    if skills:
+        skills_str = ", ".join([f"{k}: {v}" for k, v in skills.items()])
+        context_parts.append(f"Skill levels: {skills_str}")
+
+    # Add recommendations
+    recs = profile.get("recommendations", {})
+    if recs:
+        learning_recs = recs.get("learning_style", [])
+        if learning_recs:
+            context_parts.append(f"Learning recommendations: {'; '.join(learning_recs[:2])}")
+
+    # Add resume insights
+    resume_insights = profile.get("resume_insights", {})
+    if resume_insights and resume_insights.get("total_analyses", 0) > 0:
+        context_parts.append(
+            f"Resume performance: {resume_insights.get('average_score', 0)}% average score, "
+            f"{resume_insights.get('improvement_trend', 'stable')} trend"
+        )
+
+    context_parts.append("[END PERSONALIZATION INSIGHTS]\n")
+
+    return "\n".join(context_parts)
+
+
+def build_greeting_from_profile(username: str, profile: Optional[Dict[str, Any]]) -> str:
+    """Build personalized greeting text from an already-fetched profile"""
+    if not profile or not profile.get("data_available", False):
+        return f"Hi {username}! 👋"
+    
+    # Get personality type
+    comm_style = profile.get("communication_style", {})
+    formality = comm_style.get("formality", "mixed")
+    
+    # Get resume insights
+    resume_insights = profile.get("resume_insights", {})
+    has_resume = resume_insights.get("total_analyses", 0) > 0
+    
+    # Customize greeting
+    if formality == "formal":
+        greeting = f"Hello {username},"
+    else:
+        greeting = f"Hey {username}! 👋"
+    
+    # Add context-aware message
+    topics = profile.get("topics_of_interest", [])
+    if topics and len(topics) > 0:
+        greeting += f" Ready to explore {topics[0]} today?"
+    elif has_resume:
+        greeting += " How can I help you with your academic or career goals today?"
+    else:
+        greeting += " What would you like to learn about today?"
+    
+    return greeting
+
+
+class AsyncPersonalizationHelper:
+    """Async variant of PersonalizationHelper for async FastAPI endpoints
+    
+    The sync helper blocks the event loop when awaited from `async def`
+    routes, serializing all concurrent users behind one socket. This one
+    awaits httpx so in-flight profile fetches can overlap.
+    """
+    
+    def __init__(self, personalization_api_url: str = "http://localhost:8001",
+                 socket_path: Optional[str] = None):
+        self.api_url = personalization_api_url
+        # With a socket_path, requests route over a Unix domain socket
+        # (the base_url host is then only used for the Host header)
+        transport = httpx.AsyncHTTPTransport(uds=socket_path) if socket_path else None
+        self.client = httpx.AsyncClient(
+            base_url="http://localhost" if socket_path else personalization_api_url,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            transport=transport
+        )
+
+        # Fail fast instead of waiting out the 5s timeout on every call
+        # while the personalization service is down
+        self._breaker = _CircuitBreaker()
+
+    def breaker_metrics(self) -> Dict[str, Any]:
+        """Circuit-breaker state, for logging/monitoring"""
+        return self._breaker.metrics()
+
+    async def get_user_profile(self, username: str) -> Optional[Dict[str, Any]]:
+        """Fetch user personality profile without blocking the event loop"""
+        if self._breaker.is_open():
+            return None  # service known-down - skip the timeout wait
+
+        try:
+            response = await self.client.get(f"/user/{username}/profile")
+            self._breaker.record_success()
+
+            if response.status_code == 200:
+                # orjson is several times faster than the stdlib parser
+                # on these nested profile/report payloads
+                return orjson.loads(response.content)
+            else:
+                logger.warning(f"Failed to fetch profile for {username}: {response.status_code}")
+                return None
+
+        except httpx.HTTPError as e:
+            self._breaker.record_failure()
+            logger.error(f"Error connecting to personalization module: {e}")
+            return None
+
+    async def get_user_report(self, username: str) -> Optional[Dict[str, Any]]:
+        """Fetch comprehensive personality report without blocking the event loop"""
+        if self._breaker.is_open():
+            return None
+
+        try:
+            response = await self.client.get(f"/user/{username}/report")
+            self._breaker.record_success()
+
+            if response.status_code == 200:
+                # orjson is several times faster than the stdlib parser
+                # on these nested profile/report payloads
+                return orjson.loads(response.content)
+            else:
+                logger.warning(f"Failed to fetch report for {username}: {response.status_code}")
+                return None
+
+        except httpx.HTTPError as e:
+            self._breaker.record_failure()
+            logger.error(f"Error connecting to personalization module: {e}")
+            return None
+
+    async def trigger_profile_update(self, username: str) -> bool:
+        """Trigger an update of user profile in personalization module"""
+        if self._breaker.is_open():
+            return False
+
+        try:
+            response = await self.client.post(f"/user/{username}/update", timeout=10)
+            self._breaker.record_success()
+
+            if response.status_code == 200:
+                logger.info(f"Profile updated successfully for {username}")
+                return True
+            else:
+                logger.warning(f"Profile update failed for {username}: {response.status_code}")
+                return False
+
+        except httpx.HTTPError as e:
+            self._breaker.record_failure()
+            logger.error(f"Error triggering profile update: {e}")
+            return False
+    
+    async def aclose(self):
+        """Close the pooled client (call on application shutdown)"""
+        await self.client.aclose()
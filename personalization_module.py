@@ -66,6 +66,10 @@ class UserProfile(BaseModel):
     resume_insights: Dict[str, Any]  # Insights from resume analyses
     data_available: bool = False
 
+class BulkProfilesRequest(BaseModel):
+    """Request body for bulk profile fetch"""
+    usernames: List[str]
+
 class PersonalityReport(BaseModel):
     """Comprehensive personality report"""
     username: str
@@ -947,6 +951,7 @@ async def root():
         "description": "Personality analysis for Academic Chatbot and Resume Analyzer",
         "endpoints": {
             "/user/{username}/profile": "GET - Get user personality profile",
+            "/users/profiles": "POST - Get profiles for multiple users in one call",
             "/user/{username}/report": "GET - Generate personality report",
             "/user/{username}/stats": "GET - Get user statistics",
             "/user/{username}/update": "POST - Update user data",
@@ -979,6 +984,29 @@ async def get_user_profile(username: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+@app.post("/users/profiles")
+async def get_user_profiles_bulk(request: BulkProfilesRequest):
+    """Get personality profiles for several users in one call
+
+    Lets clients (chatbot cache prewarm, admin dashboards) collapse N
+    per-user GETs into a single request/response cycle.
+    """
+    try:
+        profiles = {}
+        for username in request.usernames:
+            profile = engine.get_or_create_user_profile(username)
+            response = profile.dict()
+            response["data_available"] = profile.total_interactions > 0
+            response["user_exists_in_database"] = engine.data_collector.user_exists_in_database(username)
+            profiles[username] = response
+
+        return {
+            "total_users": len(profiles),
+            "profiles": profiles
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
 @app.get("/user/{username}/report")
 async def generate_personality_report(username: str):
     """Generate comprehensive personality report"""
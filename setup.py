@@ -5,49 +5,115 @@ This script helps set up the environment and verify everything works
 """
 
 import os
+import re
 import sys
-from pathlib import Path
 import json
 
+# Placeholder value left in .env templates - compiled once for the
+# case-insensitive check instead of lowercasing the inspected string
+_PLACEHOLDER_RE = re.compile(r'your-api-key', re.IGNORECASE)
+
 def print_header(text):
     """Print a formatted header"""
     print("\n" + "=" * 60)
     print(f"  {text}")
     print("=" * 60 + "\n")
 
-def check_python_version():
+def check_python_version(ctx):
     """Check if Python version is 3.8+"""
     print("Checking Python version...")
     version = sys.version_info
-    if version.major < 3 or (version.major == 3 and version.minor < 8):
+    # Tuple comparison covers the major/minor branching in one shot and
+    # stays correct for an eventual 4.x
+    if version < (3, 8):
         print("❌ Python 3.8+ is required")
         return False
     print(f"✅ Python {version.major}.{version.minor}.{version.micro}")
     return True
 
-def check_dependencies():
+# Packages whose import name differs from the pip distribution name
+_IMPORT_NAMES = {
+    'python-dotenv': 'dotenv',
+}
+
+_REQUIRED_PACKAGES = [
+    'fastapi',
+    'uvicorn',
+    'streamlit',
+    'openai',
+    'langchain',
+    'langchain_openai',
+    'python-dotenv',
+    'pydantic'
+]
+
+_REQUIRED_FILES = [
+    'shared_database.py',
+    'main.py',
+    'interviewer.py',
+    'personalization_module.py'
+]
+
+# Marker recording the last fully passing setup run (see main())
+_MARKER_FILE = '.setup_ok'
+
+# Class object cached after the first successful import so each check
+# that needs it doesn't redo the from-import binding
+_SharedDatabase = None
+
+def _get_SharedDatabase():
+    """Import shared_database once and hand back the cached class"""
+    global _SharedDatabase
+    if _SharedDatabase is None:
+        from shared_database import SharedDatabase
+        _SharedDatabase = SharedDatabase
+    return _SharedDatabase
+
+def _setup_fingerprint():
+    """Hash of everything whose change should invalidate a passing setup"""
+    import hashlib
+
+    parts = [sys.version, ','.join(sorted(_REQUIRED_PACKAGES))]
+    for path in ['.env'] + _REQUIRED_FILES:
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+def _probe_package(package):
+    """Check that one package is installed, returning (package, available)
+
+    find_spec only locates the package on disk - actually importing
+    heavyweights like langchain or streamlit executes hundreds of
+    transitive modules just to answer a yes/no question.
+    """
+    import importlib.util
+    module = _IMPORT_NAMES.get(package, package.replace('-', '_'))
+    return (package, importlib.util.find_spec(module) is not None)
+
+def check_dependencies(ctx):
     """Check if required packages are installed"""
+    # Imported here so plain `import setup` callers don't pay for it
+    from concurrent.futures import ThreadPoolExecutor
+
     print("\nChecking dependencies...")
-    required = [
-        'fastapi',
-        'uvicorn',
-        'streamlit',
-        'openai',
-        'langchain',
-        'langchain_openai',
-        'python-dotenv',
-        'pydantic'
-    ]
-    
+    required = _REQUIRED_PACKAGES
+
+    # Heavy packages (langchain, openai, streamlit) dominate wall time
+    # and import independently, so probe them in parallel; executor.map
+    # keeps the results - and the printout - in list order
     missing = []
-    for package in required:
-        try:
-            __import__(package.replace('-', '_'))
+    with ThreadPoolExecutor(max_workers=len(required)) as executor:
+        results = list(executor.map(_probe_package, required))
+
+    for package, available in results:
+        if available:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package}")
             missing.append(package)
-    
+
     if missing:
         print("\n❌ Missing dependencies. Install with:")
         print(f"   pip install {' '.join(missing)}")
@@ -55,80 +121,90 @@ def check_dependencies():
     
     return True
 
-def create_directories():
+def create_directories(ctx):
     """Create required directories"""
     print("\nCreating directories...")
+    # makedirs creates user_data on the way to its children, so it needs
+    # no standalone entry, and exist_ok makes reruns a no-op
     dirs = [
         'shared_data',
-        'user_data',
         'user_data/profiles',
         'user_data/reports'
     ]
-    
+
     for dir_path in dirs:
-        Path(dir_path).mkdir(exist_ok=True)
+        os.makedirs(dir_path, exist_ok=True)
         print(f"✅ {dir_path}/")
-    
+
     return True
 
-def check_env_file():
+def check_env_file(ctx):
     """Check if .env file exists"""
     print("\nChecking environment configuration...")
-    env_path = Path('.env')
-    
-    if not env_path.exists():
+
+    if not os.path.isfile('.env'):
         print("⚠️  .env file not found")
         create = input("Create .env file now? (y/n): ").lower().strip()
-        
+
         if create == 'y':
             api_key = input("Enter your OpenAI API key: ").strip()
             with open('.env', 'w') as f:
                 f.write(f"OPENAI_API_KEY={api_key}\n")
+            ctx['env'] = {'OPENAI_API_KEY': api_key}
             print("✅ .env file created")
             return True
         else:
             print("❌ .env file required")
             return False
-    
+
     print("✅ .env file exists")
-    
-    # Check if API key is set
+
+    # Parse the file once into the shared context so later checks can
+    # read values without re-opening it
+    env = {}
     with open('.env') as f:
-        content = f.read()
-        if 'OPENAI_API_KEY' not in content or 'your-api-key' in content.lower():
-            print("⚠️  OpenAI API key not properly configured")
-            return False
-    
+        for line in f:
+            key, sep, value = line.partition('=')
+            if sep:
+                env[key.strip()] = value.strip()
+    ctx['env'] = env
+
+    # Check if API key is set
+    api_key = env.get('OPENAI_API_KEY', '')
+    if not api_key or _PLACEHOLDER_RE.search(api_key):
+        print("⚠️  OpenAI API key not properly configured")
+        return False
+
     print("✅ OpenAI API key configured")
     return True
 
-def check_required_files():
+def check_required_files(ctx):
     """Check if all required Python files exist"""
     print("\nChecking required files...")
-    required_files = [
-        'shared_database.py',
-        'main.py',
-        'interviewer.py',
-        'personalization_module.py'
-    ]
-    
+    required_files = _REQUIRED_FILES
+
+    # One scandir of the project root replaces a stat call per file
+    present = {entry.name for entry in os.scandir('.') if entry.is_file()}
+
     all_exist = True
     for file in required_files:
-        if Path(file).exists():
+        if file in present:
             print(f"✅ {file}")
         else:
             print(f"❌ {file} (missing)")
             all_exist = False
-    
+
     return all_exist
 
-def initialize_database():
+def initialize_database(ctx):
     """Initialize the shared database with sample structure"""
     print("\nInitializing shared database...")
     
     try:
-        from shared_database import SharedDatabase
-        db = SharedDatabase()
+        db = _get_SharedDatabase()()
+        # Stash the instance so later checks reuse it instead of
+        # re-loading the JSON stores from disk
+        ctx['db'] = db
         print("✅ Shared database initialized")
         print(f"   Location: {db.storage_dir}")
         print(f"   Users file: {db.users_file}")
@@ -138,22 +214,23 @@ def initialize_database():
         print(f"❌ Error initializing database: {e}")
         return False
 
-def run_health_checks():
+def run_health_checks(ctx):
     """Run health checks on all components"""
     print("\nRunning health checks...")
     
     # Check if we can import modules
     try:
-        from shared_database import SharedDatabase
+        SharedDatabase = _get_SharedDatabase()
         print("✅ shared_database module imports correctly")
     except Exception as e:
         print(f"❌ shared_database import error: {e}")
         return False
-    
+
     try:
-        # Try to initialize database
-        db = SharedDatabase()
-        
+        # Reuse the database from initialize_database when available -
+        # constructing another one repeats its file I/O and JSON loads
+        db = ctx.get('db') or SharedDatabase()
+
         # Create a test user
         test_user = db.get_or_create_user("test_user")
         print(f"✅ Test user created: {test_user['username']}")
@@ -193,31 +270,59 @@ def print_next_steps():
     print("📚 For more details, see README.md")
     print()
 
-def main():
+def main(force=False):
     """Main setup routine"""
+    # Skip the whole check sequence when nothing changed since the last
+    # passing run - the fingerprint covers the Python version, the
+    # dependency list, and the mtimes of .env and the required files, so
+    # any relevant change invalidates the marker automatically
+    fingerprint = _setup_fingerprint()
+    if not force and os.path.isfile(_MARKER_FILE):
+        with open(_MARKER_FILE) as f:
+            if f.read().strip() == fingerprint:
+                print("✅ Setup already verified - nothing changed since the last run")
+                print("   (use --force to re-run all checks)")
+                return 0
+
     print_header("AI System Setup - Unified Database")
-    
+
+    # Fatal checks stop the run outright - with the wrong Python or
+    # missing packages, every later check would fail anyway, just slower
     checks = [
-        ("Python Version", check_python_version),
-        ("Dependencies", check_dependencies),
-        ("Directories", create_directories),
-        ("Environment File", check_env_file),
-        ("Required Files", check_required_files),
-        ("Database Initialization", initialize_database),
-        ("Health Checks", run_health_checks)
+        ("Python Version", check_python_version, True),
+        ("Dependencies", check_dependencies, True),
+        ("Directories", create_directories, False),
+        ("Environment File", check_env_file, False),
+        ("Required Files", check_required_files, False),
+        ("Database Initialization", initialize_database, False),
+        ("Health Checks", run_health_checks, False)
     ]
-    
+
+    # Shared context threaded through the checks so later ones can reuse
+    # what earlier ones already built (e.g. the database instance)
+    ctx = {}
+
     all_passed = True
-    for name, check_func in checks:
+    for name, check_func, fatal in checks:
         try:
-            if not check_func():
+            if not check_func(ctx):
                 all_passed = False
                 print(f"\n❌ {name} check failed")
+                if fatal:
+                    print("   Skipping remaining checks until this is fixed.")
+                    break
         except Exception as e:
             all_passed = False
             print(f"\n❌ {name} check failed with error: {e}")
+            if fatal:
+                print("   Skipping remaining checks until this is fixed.")
+                break
     
     if all_passed:
+        # Record the passing run so the next invocation can skip straight
+        # through (recompute: check_env_file may have just created .env)
+        with open(_MARKER_FILE, 'w') as f:
+            f.write(_setup_fingerprint() + '\n')
         print_next_steps()
         return 0
     else:
@@ -225,4 +330,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main(force='--force' in sys.argv[1:]))
\ No newline at end of file
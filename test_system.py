@@ -3,10 +3,9 @@ Testing Script for AI System with Personalization
 Tests all three modules and their integrations
 """
 
-import requests
-import json
-import time
-from pathlib import Path
+import io
+import sys
+import threading
 
 # ===== CONFIGURATION =====
 CHATBOT_URL = "http://localhost:8000"
@@ -15,12 +14,41 @@ RESUME_ANALYZER_URL = "http://localhost:8002"
 
 TEST_USERNAME = "test_user_demo"
 
+# One pooled session for every probe in this script - keep-alive reuses
+# the TCP connection to each service instead of reconnecting per call.
+# Built lazily: importing requests pulls in urllib3 and friends, a few
+# hundred ms the interactive menu shouldn't pay before any probe runs.
+SESSION = None
+
+def _get_session():
+    """Create the pooled HTTP session on first use"""
+    global SESSION
+    if SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        SESSION = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+        SESSION.mount("http://", adapter)
+        SESSION.mount("https://", adapter)
+    return SESSION
+
 # ===== COLOR CODES FOR OUTPUT =====
-GREEN = '\033[92m'
-RED = '\033[91m'
-YELLOW = '\033[93m'
-BLUE = '\033[94m'
-RESET = '\033[0m'
+# Colors switch off automatically when stdout isn't a terminal so piped
+# and CI output stays free of escape codes
+_USE_COLOR = sys.stdout.isatty()
+GREEN = '\033[92m' if _USE_COLOR else ''
+RED = '\033[91m' if _USE_COLOR else ''
+YELLOW = '\033[93m' if _USE_COLOR else ''
+BLUE = '\033[94m' if _USE_COLOR else ''
+RESET = '\033[0m' if _USE_COLOR else ''
+
+# Message prefixes assembled once at import instead of re-building the
+# wrapping f-string on every log call
+_SUCCESS_PREFIX = GREEN + '✅ '
+_ERROR_PREFIX = RED + '❌ '
+_INFO_PREFIX = BLUE + 'ℹ️  '
+_WARNING_PREFIX = YELLOW + '⚠️  '
 
 def print_header(text):
     """Print formatted header"""
@@ -30,55 +58,67 @@ def print_header(text):
 
 def print_success(text):
     """Print success message"""
-    print(f"{GREEN}✅ {text}{RESET}")
+    print(_SUCCESS_PREFIX + text + RESET)
 
 def print_error(text):
     """Print error message"""
-    print(f"{RED}❌ {text}{RESET}")
+    print(_ERROR_PREFIX + text + RESET)
 
 def print_info(text):
     """Print info message"""
-    print(f"{BLUE}ℹ️  {text}{RESET}")
+    print(_INFO_PREFIX + text + RESET)
 
 def print_warning(text):
     """Print warning message"""
-    print(f"{YELLOW}⚠️  {text}{RESET}")
+    print(_WARNING_PREFIX + text + RESET)
 
 # ===== HEALTH CHECKS =====
 
 def check_service_health(service_name, url):
-    """Check if a service is running"""
+    """Check if a service is running, returning (ok, message)
+
+    Returns the report line instead of printing it so concurrent probes
+    don't interleave their output - the caller emits the buffered lines
+    in service order with a single write.
+    """
+    import requests
+
     try:
-        response = requests.get(f"{url}/health", timeout=5)
+        response = _get_session().get(f"{url}/health", timeout=5)
         if response.status_code == 200:
-            print_success(f"{service_name} is running")
-            return True
+            return True, _SUCCESS_PREFIX + f"{service_name} is running" + RESET
         else:
-            print_error(f"{service_name} returned status {response.status_code}")
-            return False
+            return False, _ERROR_PREFIX + f"{service_name} returned status {response.status_code}" + RESET
     except requests.exceptions.ConnectionError:
-        print_error(f"{service_name} is not running at {url}")
-        return False
+        return False, _ERROR_PREFIX + f"{service_name} is not running at {url}" + RESET
     except Exception as e:
-        print_error(f"{service_name} health check failed: {e}")
-        return False
+        return False, _ERROR_PREFIX + f"{service_name} health check failed: {e}" + RESET
 
 def run_health_checks():
     """Run health checks on all services"""
+    from concurrent.futures import ThreadPoolExecutor
+
     print_header("Health Checks")
-    
+
     services = [
         ("Chatbot", CHATBOT_URL),
         ("Personalization Module", PERSONALIZATION_URL),
         ("Resume Analyzer", RESUME_ANALYZER_URL)
     ]
-    
-    results = []
-    for name, url in services:
-        result = check_service_health(name, url)
-        results.append(result)
-        time.sleep(0.5)
-    
+
+    # The three services are independent, so probe them concurrently -
+    # the phase takes one round-trip instead of three plus sleeps.
+    # executor.map keeps the results in service order.
+    with ThreadPoolExecutor(max_workers=len(services)) as executor:
+        outcomes = list(executor.map(
+            lambda svc: check_service_health(*svc), services
+        ))
+
+    # One write for the whole report: worker threads never touch stdout,
+    # so the lines come out deterministic and the terminal flushes once
+    results = [ok for ok, _ in outcomes]
+    sys.stdout.write('\n'.join(line for _, line in outcomes) + '\n')
+
     if all(results):
         print_success("\nAll services are healthy! ✨")
         return True
@@ -90,39 +130,47 @@ def run_health_checks():
 
 def test_chatbot_basic():
     """Test basic chatbot functionality"""
+    import asyncio
+    import httpx
+
     print_header("Testing Chatbot - Basic Conversation")
-    
+
     test_messages = [
         "Hi, I'm interested in engineering colleges",
         "What are some good colleges in Bangalore?",
         "Tell me about IIT Delhi",
         "What about private universities?"
     ]
-    
-    for i, message in enumerate(test_messages, 1):
-        print_info(f"Message {i}: {message}")
-        
-        try:
-            response = requests.post(
-                f"{CHATBOT_URL}/chat",
-                json={
-                    "username": TEST_USERNAME,
-                    "message": message,
-                    "chat_id": "test_chat_001"
-                },
-                timeout=30
+
+    async def _run():
+        # The messages are independent smoke probes, not turns of one
+        # dialogue - distinct chat_ids let the backend process them in
+        # parallel, so the test costs one chat round-trip instead of four
+        async with httpx.AsyncClient(base_url=CHATBOT_URL, timeout=30) as client:
+            return await asyncio.gather(
+                *[
+                    client.post("/chat", json={
+                        "username": TEST_USERNAME,
+                        "message": message,
+                        "chat_id": f"test_chat_{i}"
+                    })
+                    for i, message in enumerate(test_messages, 1)
+                ],
+                return_exceptions=True
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print_success(f"Response: {data.get('response', '')[:100]}...")
-            else:
-                print_error(f"Failed with status {response.status_code}")
-                
-        except Exception as e:
-            print_error(f"Request failed: {e}")
-        
-        time.sleep(1)
+
+    responses = asyncio.run(_run())
+
+    for i, (message, response) in enumerate(zip(test_messages, responses), 1):
+        print_info(f"Message {i}: {message}")
+
+        if isinstance(response, Exception):
+            print_error(f"Request failed: {response}")
+        elif response.status_code == 200:
+            data = response.json()
+            print_success(f"Response: {data.get('response', '')[:100]}...")
+        else:
+            print_error(f"Failed with status {response.status_code}")
 
 def test_chatbot_resume_question():
     """Test chatbot's ability to answer resume questions"""
@@ -131,7 +179,7 @@ def test_chatbot_resume_question():
     print_info("Asking about resume performance...")
     
     try:
-        response = requests.post(
+        response = _get_session().post(
             f"{CHATBOT_URL}/chat",
             json={
                 "username": TEST_USERNAME,
@@ -158,6 +206,7 @@ def test_resume_analyzer():
     print_header("Testing Resume Analyzer")
     
     # Check if sample resume exists
+    from pathlib import Path
     sample_resume_path = Path("sample_resume.pdf")
     
     if not sample_resume_path.exists():
@@ -168,19 +217,23 @@ def test_resume_analyzer():
     print_info("Uploading resume for analysis...")
     
     try:
+        from requests_toolbelt import MultipartEncoder
+
         with open(sample_resume_path, 'rb') as f:
-            files = {'file': ('sample_resume.pdf', f, 'application/pdf')}
-            data = {
+            # Stream the multipart body straight from disk - passing the
+            # file via files= buffers the whole PDF in memory first
+            encoder = MultipartEncoder(fields={
+                'file': ('sample_resume.pdf', f, 'application/pdf'),
                 'username': TEST_USERNAME,
                 'target_role': 'Software Engineer',
-                'search_jobs': False,
+                'search_jobs': 'False',
                 'location': 'India'
-            }
-            
-            response = requests.post(
+            })
+
+            response = _get_session().post(
                 f"{RESUME_ANALYZER_URL}/analyze-resume",
-                files=files,
-                data=data,
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
                 timeout=60
             )
             
@@ -210,7 +263,7 @@ def test_get_user_analyses():
     print_info(f"Fetching analyses for {TEST_USERNAME}...")
     
     try:
-        response = requests.get(
+        response = _get_session().get(
             f"{RESUME_ANALYZER_URL}/user/{TEST_USERNAME}/analyses",
             timeout=10
         )
@@ -242,7 +295,7 @@ def test_personalization_profile():
     print_info(f"Getting profile for {TEST_USERNAME}...")
     
     try:
-        response = requests.get(
+        response = _get_session().get(
             f"{PERSONALIZATION_URL}/user/{TEST_USERNAME}/profile",
             timeout=10
         )
@@ -275,7 +328,7 @@ def test_personalization_report():
     print_info(f"Generating report for {TEST_USERNAME}...")
     
     try:
-        response = requests.get(
+        response = _get_session().get(
             f"{PERSONALIZATION_URL}/user/{TEST_USERNAME}/report",
             timeout=15
         )
@@ -312,7 +365,7 @@ def test_personalization_update():
     print_info(f"Triggering profile update for {TEST_USERNAME}...")
     
     try:
-        response = requests.post(
+        response = _get_session().post(
             f"{PERSONALIZATION_URL}/user/{TEST_USERNAME}/update",
             timeout=15
         )
@@ -346,27 +399,22 @@ def test_full_integration():
     # Step 1: Chat interactions
     print_info("Step 1: Creating chat interactions...")
     test_chatbot_basic()
-    time.sleep(2)
     
     # Step 2: Upload resume (if available)
     print_info("\nStep 2: Uploading resume...")
     resume_uploaded = test_resume_analyzer()
-    time.sleep(2)
     
     # Step 3: Trigger personalization update
     print_info("\nStep 3: Updating personalization profile...")
     test_personalization_update()
-    time.sleep(2)
     
     # Step 4: Get updated profile
     print_info("\nStep 4: Fetching updated profile...")
     test_personalization_profile()
-    time.sleep(2)
     
     # Step 5: Generate report
     print_info("\nStep 5: Generating personality report...")
     test_personalization_report()
-    time.sleep(2)
     
     # Step 6: Ask chatbot about resume
     if resume_uploaded:
@@ -377,11 +425,60 @@ def test_full_integration():
 
 # ===== MAIN TEST RUNNER =====
 
+class _ThreadOutputRouter:
+    """stdout proxy that gives each worker thread its own buffer
+
+    run_all_tests executes tests on a thread pool, but the tests print
+    their multi-line reports directly; routing writes per thread keeps
+    each test's block contiguous instead of interleaving the workers.
+    Threads that haven't called capture() - like the main thread - write
+    straight through to the real stream.
+    """
+
+    def __init__(self, real):
+        self.real = real
+        self._local = threading.local()
+
+    def capture(self):
+        """Start buffering the calling thread's writes"""
+        self._local.buffer = io.StringIO()
+
+    def release(self):
+        """Stop buffering and return what the calling thread wrote"""
+        buffer = self._local.buffer
+        self._local.buffer = None
+        return buffer.getvalue()
+
+    def write(self, text):
+        target = getattr(self._local, 'buffer', None) or self.real
+        return target.write(text)
+
+    def flush(self):
+        target = getattr(self._local, 'buffer', None) or self.real
+        target.flush()
+
+    def isatty(self):
+        return self.real.isatty()
+
+def _run_single_test(item):
+    """Run one (name, func) test with its report captured for the caller"""
+    test_name, test_func, router = item
+    router.capture()
+    try:
+        result = test_func()
+        ok = result if result is not None else True
+    except Exception as e:
+        print_error(f"{test_name} failed with exception: {e}")
+        ok = False
+    return (test_name, ok, router.release())
+
 def run_all_tests():
     """Run all tests"""
+    from concurrent.futures import ThreadPoolExecutor
+
     print_header("AI System Integration Test Suite")
     print(f"Testing with username: {TEST_USERNAME}\n")
-    
+
     # Health checks first
     if not run_health_checks():
         print_error("\nCannot proceed - services not running")
@@ -390,31 +487,51 @@ def run_all_tests():
         print("  Terminal 2: python personalization_module.py")
         print("  Terminal 3: python resume_analyzer.py")
         return
-    
-    time.sleep(1)
-    
-    # Individual component tests
+
+    # Individual component tests as (name, func, deps). deps name prior
+    # tests whose side effects must land before this one starts; tests
+    # with satisfied deps share a layer and run concurrently, so the
+    # suite takes a few layers instead of seven serial round-trips.
     tests = [
-        ("Chatbot Basic", test_chatbot_basic),
-        ("Resume Analyzer", test_resume_analyzer),
-        ("User Analyses", test_get_user_analyses),
-        ("Personalization Profile", test_personalization_profile),
-        ("Personalization Report", test_personalization_report),
-        ("Profile Update", test_personalization_update),
-        ("Chatbot Resume Question", test_chatbot_resume_question)
+        ("Chatbot Basic", test_chatbot_basic, ()),
+        ("Resume Analyzer", test_resume_analyzer, ()),
+        ("Personalization Profile", test_personalization_profile, ()),
+        ("Personalization Report", test_personalization_report, ()),
+        ("User Analyses", test_get_user_analyses, ("Resume Analyzer",)),
+        ("Profile Update", test_personalization_update,
+         ("Chatbot Basic", "Resume Analyzer")),
+        ("Chatbot Resume Question", test_chatbot_resume_question,
+         ("Resume Analyzer", "Profile Update"))
     ]
-    
+
     results = []
-    for test_name, test_func in tests:
-        print_info(f"\nRunning: {test_name}")
-        try:
-            result = test_func()
-            results.append((test_name, result if result is not None else True))
-        except Exception as e:
-            print_error(f"Test failed with exception: {e}")
-            results.append((test_name, False))
-        time.sleep(1)
-    
+    done = set()
+    remaining = list(tests)
+    # The tests print their reports directly, so route stdout through the
+    # per-thread buffers while the pool runs; each block is written out
+    # whole once its test resolves instead of interleaving the workers
+    router = _ThreadOutputRouter(sys.stdout)
+    sys.stdout = router
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            while remaining:
+                layer = [(name, func) for name, func, deps in remaining
+                         if all(dep in done for dep in deps)]
+                if not layer:
+                    # Shouldn't happen, but never deadlock on a bad deps list
+                    layer = [(name, func) for name, func, _ in remaining]
+                layer_names = {name for name, _ in layer}
+                remaining = [t for t in remaining if t[0] not in layer_names]
+
+                print_info(f"\nRunning: {', '.join(name for name, _ in layer)}")
+                items = [(name, func, router) for name, func in layer]
+                for name, ok, output in executor.map(_run_single_test, items):
+                    router.real.write(output)
+                    results.append((name, ok))
+                done.update(layer_names)
+    finally:
+        sys.stdout = router.real
+
     # Print summary
     print_header("Test Summary")
     passed = sum(1 for _, result in results if result)
@@ -433,57 +550,76 @@ def run_all_tests():
 
 # ===== INTERACTIVE MENU =====
 
+def _test_chatbot_suite():
+    test_chatbot_basic()
+    test_chatbot_resume_question()
+
+def _test_resume_suite():
+    test_resume_analyzer()
+    test_get_user_analyses()
+
+def _test_personalization_suite():
+    test_personalization_profile()
+    test_personalization_report()
+    test_personalization_update()
+
+def _quick_smoke_test():
+    print_header("Quick Smoke Test")
+    if run_health_checks():
+        print_success("System is operational!")
+
+# Menu text rendered once instead of re-printing line by line each loop
+_MENU_TEXT = (
+    "\n" + "=" * 60 + "\n"
+    "  AI System Test Menu\n"
+    + "=" * 60 + "\n\n"
+    "1. Run all tests\n"
+    "2. Health checks only\n"
+    "3. Test chatbot\n"
+    "4. Test resume analyzer\n"
+    "5. Test personalization\n"
+    "6. Full integration test\n"
+    "7. Quick smoke test\n"
+    "0. Exit"
+)
+
+# Choice -> handler dispatch instead of an if/elif chain per keystroke
+_MENU = {
+    "1": run_all_tests,
+    "2": run_health_checks,
+    "3": _test_chatbot_suite,
+    "4": _test_resume_suite,
+    "5": _test_personalization_suite,
+    "6": test_full_integration,
+    "7": _quick_smoke_test,
+}
+
 def interactive_menu():
     """Interactive test menu"""
     while True:
-        print_header("AI System Test Menu")
-        print("1. Run all tests")
-        print("2. Health checks only")
-        print("3. Test chatbot")
-        print("4. Test resume analyzer")
-        print("5. Test personalization")
-        print("6. Full integration test")
-        print("7. Quick smoke test")
-        print("0. Exit")
-        
+        print(_MENU_TEXT)
+
         choice = input("\nEnter your choice: ").strip()
-        
+
         if choice == "0":
             print_info("Goodbye!")
             break
-        elif choice == "1":
-            run_all_tests()
-        elif choice == "2":
-            run_health_checks()
-        elif choice == "3":
-            test_chatbot_basic()
-            test_chatbot_resume_question()
-        elif choice == "4":
-            test_resume_analyzer()
-            test_get_user_analyses()
-        elif choice == "5":
-            test_personalization_profile()
-            test_personalization_report()
-            test_personalization_update()
-        elif choice == "6":
-            test_full_integration()
-        elif choice == "7":
-            print_header("Quick Smoke Test")
-            if run_health_checks():
-                print_success("System is operational!")
+
+        handler = _MENU.get(choice)
+        if handler:
+            handler()
         else:
             print_warning("Invalid choice")
-        
+
         input("\nPress Enter to continue...")
 
+# CLI mode flags -> entry points; anything else opens the menu
+_MODES = {
+    "--all": run_all_tests,
+    "--health": run_health_checks,
+    "--integration": test_full_integration,
+}
+
 if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) > 1 and sys.argv[1] == "--all":
-        run_all_tests()
-    elif len(sys.argv) > 1 and sys.argv[1] == "--health":
-        run_health_checks()
-    elif len(sys.argv) > 1 and sys.argv[1] == "--integration":
-        test_full_integration()
-    else:
-        interactive_menu()
\ No newline at end of file
+    mode = sys.argv[1] if len(sys.argv) > 1 else None
+    (_MODES.get(mode) or interactive_menu)()
\ No newline at end of file